@@ -0,0 +1,45 @@
+// Clientside figure builders for the CCD Visualizer Dashboard.
+// Each function receives the chart data stored by update_tab_contents and the
+// current figure, whose layout is kept as-is so only the traces are rebuilt.
+
+// Above this many bars SVG rendering gets slow, so switch to WebGL markers
+var WEBGL_POINT_LIMIT = 15000;
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    charts: {
+        buildBar: function(data, figure) {
+            if (!data) {
+                return window.dash_clientside.no_update;
+            }
+            var useWebGL = data.names.length * data.weeks.length > WEBGL_POINT_LIMIT;
+            return {
+                data: data.weeks.map(function(stars, i) {
+                    var trace = {x: data.names, y: stars, name: 'Week ' + (i + 1)};
+                    if (useWebGL) {
+                        trace.type = 'scattergl';
+                        trace.mode = 'markers';
+                    } else {
+                        trace.type = 'bar';
+                        trace.marker = {line: {width: 0}};
+                    }
+                    return trace;
+                }),
+                layout: figure.layout
+            };
+        },
+
+        buildPie: function(data, figure) {
+            if (!data) {
+                return window.dash_clientside.no_update;
+            }
+            return {
+                data: [{
+                    labels: data.stars.map(function(star, i) { return data.counts[i] + ' students = ' + star + ' stars'; }),
+                    values: data.counts,
+                    type: 'pie'
+                }],
+                layout: figure.layout
+            };
+        }
+    }
+});
@@ -0,0 +1,26 @@
+# Numeric kernels for the CCD Visualizer Dashboard.
+# Run `python kernels.py` to compile them ahead of time into the ccd_kernels
+# extension module, so app.py does not pay the Numba JIT cost on first upload.
+# numba.pycc is deprecated and scheduled for removal upstream, so the build step
+# needs the numba version pinned in requirements.txt (0.58.1 still ships pycc).
+import numpy as np
+
+
+# Row-wise max of star counts, where -1 marks a blank week
+def row_max(a):
+    out = np.empty(a.shape[0], dtype=np.int8)
+    for i in range(a.shape[0]):
+        m = -1
+        for j in range(a.shape[1]):
+            if a[i, j] > m:
+                m = a[i, j]
+        out[i] = m
+    return out
+
+
+if __name__ == '__main__':
+    from numba.pycc import CC
+
+    cc = CC('ccd_kernels')
+    cc.export('row_max', 'i1[:](i1[:,:])')(row_max)
+    cc.compile()